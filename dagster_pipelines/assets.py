@@ -1,9 +1,9 @@
 import dagster as dg
 from dagster_pipelines.etl.extract import read_excel, read_csv
 from dagster_pipelines.etl.transform import pivot_data
-from dagster_pipelines.etl.load import load_to_duckdb
-from datetime import datetime
-import duckdb
+from dagster_pipelines.etl.load import load_to_duckdb, create_preview_table
+from dagster_pipelines.resources import DuckDBResource, DUCKDB_OP_TAGS
+import numpy as np
 import pandas as pd
 from dagster import asset, Output, MetadataValue
 from dagster import get_dagster_logger
@@ -16,7 +16,8 @@ def create_preview_table_asset(asset_name: str, deps: list, table_name: str):
     Creates a Dagster asset that previews the top 5 rows from a specified DuckDB table.
 
     This Decorator function dynamically generates an asset function that connects to the DuckDB database,
-    retrieves the top 5 rows from the specified table, and returns the result as a Pandas DataFrame
+    retrieves the top 5 rows stored in the "<table_name>_preview" table when the specified table was
+    loaded, and returns the result as a Pandas DataFrame
     wrapped in a Dagster Output object. The output includes metadata containing a markdown
     representation of the DataFrame.
 
@@ -29,42 +30,114 @@ def create_preview_table_asset(asset_name: str, deps: list, table_name: str):
         Callable: A function that, when executed, retrieves and returns the preview of the table.
     """
 
-    @asset(name=asset_name, compute_kind="duckdb", group_name="plan", deps=deps)
-    def _preview_asset() -> Output[pd.DataFrame]:
-        with duckdb.connect("/opt/dagster/app/dagster_pipelines/db/plan.db") as con:
+    @asset(name=asset_name, compute_kind="duckdb", group_name="plan", deps=deps, op_tags=DUCKDB_OP_TAGS)
+    def _preview_asset(duckdb: DuckDBResource) -> Output[pd.DataFrame]:
+        with duckdb.get_connection() as con:
 
             logger.info(f"\n== Top 5 rows from {table_name} ==")
-            df = con.execute(f"SELECT * FROM plan.plan.{table_name} LIMIT 5").df()
+            df = con.execute(f"SELECT * FROM {table_name}_preview").df()
 
             return Output(
                 value=df,
-                metadata={"df": MetadataValue.md(df.head().to_markdown())}
+                metadata={"df": MetadataValue.md(df.to_markdown(index=False))}
             )
 
     return _preview_asset
 
+# pandas dtypes that the Python types used in expected_types map to
+_EXPECTED_DTYPES = {
+    int: np.dtype("int64"),
+    float: np.dtype("float64"),
+    str: np.dtype("object"),
+}
+
+def compile_schema(expected_types: dict) -> dict:
+    """
+    Resolves a dictionary of expected column types into the dtypes validate_data compares against.
+
+    Schemas are compiled once at import, so every asset run reuses the same resolved dtypes.
+
+    Args:
+        expected_types (dict): A dictionary of column names to their expected data types, either Python types,
+            NumPy scalar types, pandas dtypes or dtype names such as "category".
+
+    Returns:
+        dict: A dictionary of column names to their expected dtypes.
+    """
+    return {
+        # dtype names stay as they are: is_dtype_equal matches "category" against any categorical,
+        # whereas pandas_dtype("category") would only match categoricals without categories
+        col: dtype if isinstance(dtype, str)
+        else _EXPECTED_DTYPES[dtype] if dtype in _EXPECTED_DTYPES
+        else pd.api.types.pandas_dtype(dtype)
+        for col, dtype in expected_types.items()
+    }
+
+KPI_FY_SCHEMA = compile_schema({
+    "Fiscal_Year": int,
+    "Center_ID": str,
+    "Kpi Number": str,
+    "Kpi_Name": str,
+    "Unit": str,
+    "Plan_Total": np.float32,
+    "Plan_Q1": np.float32,
+    "Plan_Q2": np.float32,
+    "Plan_Q3": np.float32,
+    "Plan_Q4": np.float32,
+    "Actual_Total": np.float32,
+    "Actual_Q1": np.float32,
+    "Actual_Q2": np.float32,
+    "Actual_Q3": np.float32,
+    "Actual_Q4": np.float32,
+})
+
+PIVOT_KPI_FY_SCHEMA = compile_schema({
+    "Fiscal_Year": int,
+    "Center_ID": "category",
+    "Kpi Number": "category",
+    "Kpi_Name": str,
+    "Unit": "category",
+    "Amount Name": "category",
+    "Amount": np.float32,
+    "Amount Type": "category",
+})
+
+M_CENTER_SCHEMA = compile_schema({
+    "Center_ID": str,
+    "Center_Name": str,
+})
+
 # 2.3.1.1 Load pivoted KPI_FY.xlsm into KPI_FY
 def validate_data(df: pd.DataFrame, expected_types: dict, passed_info: str) -> pd.DataFrame:
         """
         Validates a DataFrame against a set of expected column types.
 
+        Every column is checked before raising, so the error lists all problems at once.
+
         Args:
             df (pd.DataFrame): The DataFrame to validate.
-            expected_types (dict): A dictionary of column names to their expected data types.
+            expected_types (dict): A dictionary of column names to their expected dtypes, as returned by compile_schema.
             passed_info (str): A string of information to log if the validation is successful.
 
         Returns:
             pd.DataFrame: The validated DataFrame.
 
         Raises:
-            ValueError: If a column is missing.
-            TypeError: If a column's data type does not match the expected type.
+            ValueError: If any column is missing.
+            TypeError: If any column's data type does not match the expected type.
         """
-        for col, dtype in expected_types.items():
-            if col not in df.columns:
-                raise ValueError(f"Missing expected column: {col}")
-            if not pd.api.types.is_dtype_equal(df[col].dtype, pd.Series(dtype()).dtype):
-                raise TypeError(f"Column '{col}' expected type {dtype}, but got {df[col].dtype}")
+        missing = [f"Missing expected column: {col}" for col in expected_types if col not in df.columns]
+        if missing:
+            raise ValueError("; ".join(missing))
+
+        mismatched = [
+            f"Column '{col}' expected type {dtype}, but got {df[col].dtype}"
+            for col, dtype in expected_types.items()
+            if not pd.api.types.is_dtype_equal(df[col].dtype, dtype)
+        ]
+        if mismatched:
+            raise TypeError("; ".join(mismatched))
+
         logger.info(passed_info)
         return df
 
@@ -82,24 +155,7 @@ def read_validated_kpi_fy(context: dg.AssetExecutionContext) -> pd.DataFrame:
     """
     ################ to test how error handling works, set validate_dtypes to False ##################
     kpi_data = read_excel(file_path="dagster_pipelines/data/KPI_FY.xlsm", validate_dtypes=True)
-    expected_types = {
-        "Fiscal_Year": int,
-        "Center_ID": str,
-        "Kpi Number": str,
-        "Kpi_Name": str,
-        "Unit": str,
-        "Plan_Total": float,
-        "Plan_Q1": float,
-        "Plan_Q2": float,
-        "Plan_Q3": float,
-        "Plan_Q4": float,
-        "Actual_Total": float,
-        "Actual_Q1": float,
-        "Actual_Q2": float,
-        "Actual_Q3": float,
-        "Actual_Q4": float,
-    }
-    return validate_data(kpi_data, expected_types=expected_types, passed_info="KPI data passed validation.")
+    return validate_data(kpi_data, expected_types=KPI_FY_SCHEMA, passed_info="KPI data passed validation.")
 
 # 2. Pivot and validate KPI data
 @dg.asset(compute_kind="duckdb", group_name="plan", deps=[read_validated_kpi_fy])
@@ -120,22 +176,12 @@ def pivot_validated_kpi_fy(context: dg.AssetExecutionContext, read_validated_kpi
     """
 
     pivot_kpi = pivot_data(read_validated_kpi_fy)
-    expected_types = {
-        "Fiscal_Year": int,
-        "Center_ID": str,
-        "Kpi Number": str,
-        "Kpi_Name": str,
-        "Unit": str,
-        "Amount Name": str,
-        "Amount": float,
-        "Amount Type": str,
-    }
     
-    return validate_data(pivot_kpi, expected_types=expected_types, passed_info="Pivoted KPI data passed validation.")
+    return validate_data(pivot_kpi, expected_types=PIVOT_KPI_FY_SCHEMA, passed_info="Pivoted KPI data passed validation.")
 
 # 3. Load final KPI data into DuckDB
-@dg.asset(compute_kind="duckdb", group_name="plan", deps=[pivot_validated_kpi_fy])
-def kpi_fy(context: dg.AssetExecutionContext, pivot_validated_kpi_fy: pd.DataFrame) -> None:
+@dg.asset(compute_kind="duckdb", group_name="plan", deps=[pivot_validated_kpi_fy], op_tags=DUCKDB_OP_TAGS)
+def kpi_fy(context: dg.AssetExecutionContext, pivot_validated_kpi_fy: pd.DataFrame, duckdb: DuckDBResource) -> None:
     """
     Loads the pivoted and validated KPI evaluation data into the "KPI_FY" table in DuckDB.
 
@@ -147,6 +193,7 @@ def kpi_fy(context: dg.AssetExecutionContext, pivot_validated_kpi_fy: pd.DataFra
     Args:
         context (dg.AssetExecutionContext): The execution context for the asset.
         pivot_validated_kpi_fy (pd.DataFrame): A Pandas DataFrame containing the pivoted and validated KPI evaluation data.
+        duckdb (DuckDBResource): The resource providing the DuckDB connection.
     """
     column_definitions = """
         Fiscal_Year INT,
@@ -158,7 +205,8 @@ def kpi_fy(context: dg.AssetExecutionContext, pivot_validated_kpi_fy: pd.DataFra
         Amount FLOAT,
         Amount_Type VARCHAR(50)
     """
-    load_to_duckdb(pivot_validated_kpi_fy, "KPI_FY", column_definitions)
+    with duckdb.get_connection() as con:
+        load_to_duckdb(pivot_validated_kpi_fy, "KPI_FY", column_definitions, con=con)
 
 # preview KPI_FY database
 preview_kpi_fy = create_preview_table_asset(
@@ -180,14 +228,10 @@ def read_validate_m_center(context: dg.AssetExecutionContext) -> pd.DataFrame:
         pd.DataFrame: A Pandas DataFrame containing the validated center master data.
     """
     center_data = read_csv(file_path="dagster_pipelines/data/M_Center.csv")
-    expected_types = {
-        "Center_ID": str,
-        "Center_Name": str,
-    }
-    return validate_data(center_data, expected_types=expected_types, passed_info="M_Center data passed validation.")
+    return validate_data(center_data, expected_types=M_CENTER_SCHEMA, passed_info="M_Center data passed validation.")
 
-@dg.asset(compute_kind="duckdb", group_name="plan")
-def m_center(context: dg.AssetExecutionContext, read_validate_m_center: pd.DataFrame):
+@dg.asset(compute_kind="duckdb", group_name="plan", op_tags=DUCKDB_OP_TAGS)
+def m_center(context: dg.AssetExecutionContext, read_validate_m_center: pd.DataFrame, duckdb: DuckDBResource):
 
     """
     Loads the validated center master data into the M_Center table in the plan schema.
@@ -195,13 +239,15 @@ def m_center(context: dg.AssetExecutionContext, read_validate_m_center: pd.DataF
     Args:
         context (dg.AssetExecutionContext): The execution context for the asset.
         read_validate_m_center (pd.DataFrame): A Pandas DataFrame containing the validated center master data.
+        duckdb (DuckDBResource): The resource providing the DuckDB connection.
 
     Returns:
         None
     """
     
     column_definitions = "Center_ID VARCHAR(8), Center_Name NVARCHAR"
-    load_to_duckdb(read_validate_m_center, "M_Center", column_definitions)
+    with duckdb.get_connection() as con:
+        load_to_duckdb(read_validate_m_center, "M_Center", column_definitions, con=con)
 
 # preview M_Center database
 preview_m_center = create_preview_table_asset(
@@ -211,38 +257,37 @@ preview_m_center = create_preview_table_asset(
 )
 
 # 2.3.2 Create asset kpi_fy_final_asset()
-@dg.asset(compute_kind="duckdb", group_name="plan", deps=[preview_kpi_fy, preview_m_center])
-def kpi_fy_final_asset(context: dg.AssetExecutionContext):
+@dg.asset(compute_kind="duckdb", group_name="plan", deps=[preview_kpi_fy, preview_m_center], op_tags=DUCKDB_OP_TAGS)
+def kpi_fy_final_asset(context: dg.AssetExecutionContext, duckdb: DuckDBResource):
 
     """
-    Joins the KPI_FY and M_Center tables in DuckDB based on Center_ID, adds an updated_at column, and loads the joined DataFrame into the KPI_FY_Final table in the plan schema.
+    Joins the KPI_FY and M_Center tables in DuckDB based on Center_ID, adds an updated_at column, and stores the result in the KPI_FY_Final table in the plan schema.
 
     This asset performs the following operations:
     - Connects to the DuckDB database.
-    - Queries the KPI_FY and M_Center tables.
-    - Joins the two DataFrames on Center_ID using a left join.
+    - Left joins KPI_FY with M_Center on Center_ID inside DuckDB, without pulling either table into pandas.
     - Adds an updated_at column with the current datetime.
-    - Loads the joined DataFrame into the KPI_FY_Final table in the plan schema.
+    - Creates (or replaces) the KPI_FY_Final table in the plan schema from the joined result.
+    - Stores the top 5 rows in the KPI_FY_Final_preview table.
 
     Args:
         context (dg.AssetExecutionContext): The execution context for the asset.
+        duckdb (DuckDBResource): The resource providing the DuckDB connection.
     """
     
     # Connect to the DuckDB database
-    with duckdb.connect("/opt/dagster/app/dagster_pipelines/db/plan.db") as con:
-
-        # Query both tables
-        df_kpi = con.execute("SELECT * FROM plan.plan.KPI_FY").fetchdf()
-        df_center = con.execute("SELECT * FROM plan.plan.M_Center").fetchdf()
-
-        # Join on Center_ID
-        df_joined = pd.merge(df_kpi, df_center, on="Center_ID", how="left")
-
-        # Add updated_at column
-        df_joined["updated_at"] = datetime.now()
-
-        # Load the joined DataFrame into the DuckDB table
-        load_to_duckdb(df_joined, "KPI_FY_Final")
+    with duckdb.get_connection() as con:
+
+        # Join on Center_ID and add updated_at in a single CTAS
+        # (now() is cast to TIMESTAMP to keep the naive local time datetime.now() used to give)
+        con.sql("""
+            CREATE OR REPLACE TABLE KPI_FY_Final AS
+            SELECT k.*, c.Center_Name, now()::TIMESTAMP AS updated_at
+            FROM KPI_FY k
+            LEFT JOIN M_Center c USING (Center_ID);
+        """)
+        create_preview_table("KPI_FY_Final", con=con)
+        logger.info("Data successfully inserted into table 'KPI_FY_Final'.")
 
 # preview KPI_FY_Final database
 preview_kpi_fy_final = create_preview_table_asset(
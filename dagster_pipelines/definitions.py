@@ -1,8 +1,17 @@
-from dagster import Definitions, load_assets_from_modules
+from dagster import Definitions, load_assets_from_modules, multiprocess_executor
 from dagster_pipelines import assets
+from dagster_pipelines.resources import DuckDBResource, DUCKDB_OP_TAGS
 from dagster_pipelines.schedules import kpi_fy_monthly_job_schedule
 
 defs = Definitions(
     assets=load_assets_from_modules([assets]),
     schedules=[kpi_fy_monthly_job_schedule],
+    resources={"duckdb": DuckDBResource(database="/opt/dagster/app/dagster_pipelines/db/plan.db")},
+    # Steps still run in parallel in separate processes (one per CPU by default),
+    # but only one step at a time may open the DuckDB file
+    executor=multiprocess_executor.configured({
+        "tag_concurrency_limits": [
+            {"key": key, "value": value, "limit": 1} for key, value in DUCKDB_OP_TAGS.items()
+        ],
+    }),
 )
\ No newline at end of file
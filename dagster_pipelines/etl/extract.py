@@ -1,9 +1,100 @@
+import functools
+import hashlib
+import inspect
+import os
 import pandas as pd
+from dagster import get_dagster_logger
+from openpyxl import load_workbook
+
+logger = get_dagster_logger()
+
+# Directory where parsed source files are cached between runs: under DAGSTER_HOME, or the project root
+# when it is not set, so pickles are never loaded from a world-writable location such as /tmp
+CACHE_DIR = os.path.join(
+    os.environ.get("DAGSTER_HOME", os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    ".cache",
+    "dagster_pipelines",
+)
+
+def _cache_dir_is_private() -> bool:
+    """
+    Check that CACHE_DIR exists, belongs to the current user and is not writable by anyone else.
+
+    Returns:
+        bool: True if pickles in CACHE_DIR can be trusted.
+    """
+    try:
+        stat = os.stat(CACHE_DIR)
+    except OSError:
+        return False
+    if not hasattr(os, "getuid"):
+        # no POSIX ownership to check (e.g. Windows); rely on the directory being project-owned
+        return True
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
+def cache_by_source_file(read_func):
+    """
+    Decorator that caches the DataFrame returned by a reader, keyed on the file it reads.
+
+    The parsed DataFrame is pickled to CACHE_DIR together with the source file's path, modification
+    time and size, the reader's other arguments and a hash of the reader's source code (or bytecode when
+    the source is not available). While those still match, later calls load the pickle instead of
+    parsing the file again; editing the reader invalidates its cached frames.
+
+    Args:
+        read_func (Callable): A reader taking the source path as its "file_path" argument and returning a DataFrame.
+
+    Returns:
+        Callable: The reader wrapped with the cache.
+    """
+    try:
+        reader_source = inspect.getsource(read_func).encode()
+    except (OSError, TypeError):
+        # source not available (e.g. a .pyc-only install): fall back to the compiled bytecode
+        reader_source = read_func.__code__.co_code
+    reader_version = hashlib.sha256(reader_source).hexdigest()
+
+    @functools.wraps(read_func)
+    def _cached_read(*args, **kwargs) -> pd.DataFrame:
+        bound = inspect.signature(read_func).bind(*args, **kwargs)
+        bound.apply_defaults()
+        file_path = bound.arguments["file_path"]
+
+        stat = os.stat(file_path)
+        key = (
+            reader_version,
+            os.path.abspath(file_path),
+            stat.st_mtime_ns,
+            stat.st_size,
+            sorted(bound.arguments.items()),
+        )
+        cache_path = os.path.join(CACHE_DIR, f"{read_func.__name__}_{os.path.basename(file_path)}.pkl")
+
+        if _cache_dir_is_private() and os.path.exists(cache_path):
+            try:
+                cached_key, df = pd.read_pickle(cache_path)
+                if cached_key == key:
+                    return df
+            except Exception as e:  # noqa: BLE001 - any unreadable pickle (e.g. from another pandas version) means re-parse
+                logger.warning(f"Ignoring unreadable cache file {cache_path}: {e}")
+
+        df = read_func(*bound.args, **bound.kwargs)
+
+        # write to a temporary file first, so a concurrent reader never sees a partial pickle
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        if _cache_dir_is_private():
+            pd.to_pickle((key, df), f"{cache_path}.{os.getpid()}")
+            os.replace(f"{cache_path}.{os.getpid()}", cache_path)
+        return df
+
+    return _cached_read
 
 # 2.1.1 Read KPI evaluation data from the "Data to DB" sheet in the "KPI_FY.xlsm" Excel file
+@cache_by_source_file
 def read_excel(file_path: str = "dagster_pipelines\data\KPI_FY.xlsm", validate_dtypes: bool = True) -> pd.DataFrame:
     """
     Read KPI evaluation data from the "Data to DB" sheet in the "KPI_FY.xlsm" Excel file. Extract the data and return it as a Pandas DataFrame.
+    The result is cached and reused until the Excel file changes.
 
     Args:
         file_path (str): The path to the "KPI_FY.xlsm" Excel file.
@@ -13,36 +104,59 @@ def read_excel(file_path: str = "dagster_pipelines\data\KPI_FY.xlsm", validate_d
         pd.DataFrame: A Pandas DataFrame containing the KPI evaluation data.
     """
 
-    # Code to read data from the Excel file
-    xls = pd.ExcelFile(file_path, engine="openpyxl")
-    df = xls.parse("Data to DB")
+    # Code to read data from the Excel file, streaming rows in read-only mode
+    wb = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        rows = wb["Data to DB"].iter_rows(values_only=True)
+        header = next(rows, ())
+
+        # skip blank header cells and reject duplicate names, so every column keeps its own list
+        names = [col for col in header if col is not None]
+        duplicates = sorted({str(col) for col in names if names.count(col) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate column names in the Excel file: {', '.join(duplicates)}")
+
+        columns = {col: [] for col in names}
+        for row in rows:
+            # skip blank rows, like pandas does when parsing the sheet
+            if all(value is None for value in row):
+                continue
+            for col, value in zip(header, row):
+                if col is not None:
+                    columns[col].append(value)
+    finally:
+        wb.close()
+
+    # Control datatype for the text columns while building the DataFrame, instead of casting it afterwards
+    dtypes = {
+        "Fiscal_Year": int,
+        "Center_ID": str,
+        "Kpi Number": str,
+        "Kpi_Name": str,
+        "Unit": str,
+    } if validate_dtypes else {}
+    df = pd.DataFrame({col: pd.Series(values, dtype=dtypes.get(col)) for col, values in columns.items()})
     if df.empty:
         raise ValueError("No data found in the Excel file.")
 
     if validate_dtypes:
         # Convert columns with potential mixed types (strings and numbers) to numeric, forcing errors to NaN
+        # (stored as float32, which matches the FLOAT column they are loaded into)
         numeric_columns = [
             'Plan_Total', 'Plan_Q1', 'Plan_Q2', 'Plan_Q3', 'Plan_Q4',
             'Actual_Total', 'Actual_Q1', 'Actual_Q2', 'Actual_Q3', 'Actual_Q4'
         ]
         for col in numeric_columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-
-        # Control datatype for other columns
-        df = df.astype({
-            "Fiscal_Year": int,
-            "Center_ID": str,
-            "Kpi Number": str,
-            "Kpi_Name": str,
-            "Unit": str,
-        })
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
         
     return df
 
 # 2.1.2 Read center master data from the "M_Center.csv" CSV file
+@cache_by_source_file
 def read_csv(file_path:str="dagster_pipelines\data\M_Center.csv", validate_dtypes: bool = True) -> pd.DataFrame:
     """
     Read center master data from the "M_Center.csv" CSV file. Extract the data and return it as a Pandas DataFrame.
+    The result is cached and reused until the CSV file changes.
 
     Args:
         file_path (str): The path to the "M_Center.csv" CSV file.
@@ -52,16 +166,13 @@ def read_csv(file_path:str="dagster_pipelines\data\M_Center.csv", validate_dtype
         pd.DataFrame: A Pandas DataFrame containing the center master data.
     """
     
-    # Code to read data from the CSV file
-    df = pd.read_csv(file_path)
+    # Code to read data from the CSV file, controlling datatype at parse time
+    dtypes = {
+        "Center_ID": str,
+        "Center_Name": str,
+    } if validate_dtypes else None
+    df = pd.read_csv(file_path, dtype=dtypes)
     if df.empty:
         raise ValueError("No data found in the CSV file.")
 
-    if validate_dtypes:
-        # control datatype
-        df = df.astype({
-            "Center_ID": str,
-            "Center_Name": str,
-            })
-
     return df
\ No newline at end of file
@@ -1,37 +1,108 @@
 from dagster import get_dagster_logger
+import re
 import duckdb
 import pandas as pd
 
 logger = get_dagster_logger()
 
-def load_to_duckdb(df: pd.DataFrame, table_name: str, column_definitions: str = None) -> None:
+# Keywords that start a table-level constraint, or mark a column constraint after the type
+_TABLE_CONSTRAINT_KEYWORDS = {"CONSTRAINT", "PRIMARY", "UNIQUE", "CHECK", "FOREIGN"}
+_COLUMN_CONSTRAINT_KEYWORDS = _TABLE_CONSTRAINT_KEYWORDS | {
+    "NOT", "NULL", "KEY", "DEFAULT", "REFERENCES", "COLLATE", "GENERATED", "AS",
+}
+
+def quote_identifier(name: str) -> str:
+    """
+    Quote a column name for use in SQL, doubling any embedded double quotes.
+
+    Args:
+        name (str): The column name.
+
+    Returns:
+        str: The quoted identifier.
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+def parse_column_definitions(column_definitions: str) -> list[tuple[str, str]]:
     """
-    Load a DataFrame into DuckDB with explicit column types.
+    Split SQL column definitions into (column name, type) pairs.
+
+    Only plain "<name> <TYPE>" entries are supported, since each type is used in a CAST; column or
+    table constraints such as NOT NULL, PRIMARY KEY or DEFAULT are rejected.
+
+    Args:
+        column_definitions (str): Column names and types, e.g., "col1 INT, col2 DECIMAL(10, 2)".
+
+    Returns:
+        list[tuple[str, str]]: The column names and their types, in order.
+
+    Raises:
+        ValueError: If an entry is not a plain column name followed by a type.
+    """
+    columns = []
+    # split on commas that are not inside a type's parentheses
+    for definition in re.split(r",(?![^()]*\))", column_definitions):
+        if not definition.strip():
+            continue
+        parts = definition.strip().split(None, 1)
+        type_words = {word.upper() for word in re.findall(r"[A-Za-z_]+", parts[-1])}
+        if (
+            len(parts) != 2
+            or parts[0].upper() in _TABLE_CONSTRAINT_KEYWORDS
+            or type_words & _COLUMN_CONSTRAINT_KEYWORDS
+        ):
+            raise ValueError(
+                f"Unsupported column definition '{definition.strip()}': expected '<name> <TYPE>' without constraints."
+            )
+        columns.append((parts[0], parts[1]))
+    return columns
+
+def create_preview_table(table_name: str, *, con: duckdb.DuckDBPyConnection) -> None:
+    """
+    Store the top 5 rows of a table in a "<table_name>_preview" table, so previews read a tiny table.
+
+    Args:
+        table_name (str): The table to preview.
+        con (duckdb.DuckDBPyConnection): An open connection to the DuckDB database.
+    """
+    con.sql(f"CREATE OR REPLACE TABLE {table_name}_preview AS SELECT * FROM {table_name} LIMIT 5;")
+
+def load_to_duckdb(df: pd.DataFrame, table_name: str, column_definitions: str = None, *, con: duckdb.DuckDBPyConnection) -> None:
+    """
+    Load a DataFrame into DuckDB with explicit column types and refresh its preview table.
     
     Args:
         df (pd.DataFrame): The DataFrame to insert.
         table_name (str): Target table name.
-        column_definitions (str): SQL column definitions, e.g., "col1 INT, col2 VARCHAR".
+        column_definitions (str): Column names and types, e.g., "col1 INT, col2 VARCHAR". Constraints such as
+            NOT NULL, PRIMARY KEY or DEFAULT are not supported; see parse_column_definitions.
+        con (duckdb.DuckDBPyConnection): An open connection to the DuckDB database, with plan as its default schema.
     """
     try:
-        with duckdb.connect("/opt/dagster/app/dagster_pipelines/db/plan.db") as con:
-            logger.info("Connected to DuckDB successfully.")
-            
-            con.sql("CREATE SCHEMA IF NOT EXISTS plan;")
+        # Create the table with defined schema
+        if column_definitions is None:
             con.register('df_view', df)
+            con.sql(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM df_view;")
+        else:
+            columns = parse_column_definitions(column_definitions)
+            if len(columns) != len(df.columns):
+                raise ValueError(
+                    f"Expected {len(columns)} columns for table '{table_name}', but the DataFrame has {len(df.columns)}."
+                )
+
+            # Cast the DataFrame columns, by position, to the defined names and types in a single CTAS
+            cast_select = ", ".join(
+                f"CAST({quote_identifier(df_col)} AS {col_type}) AS {col_name}"
+                for df_col, (col_name, col_type) in zip(df.columns, columns)
+            )
+            con.register('df_view', df)
+            con.sql(f"CREATE OR REPLACE TABLE {table_name} AS SELECT {cast_select} FROM df_view;")
+
+        create_preview_table(table_name, con=con)
 
-            # Create the table with defined schema
-            if column_definitions is None:       
-                con.sql(f"CREATE OR REPLACE TABLE plan.plan.{table_name} AS SELECT * FROM df_view;")
-            else:
-                con.sql(f"CREATE OR REPLACE TABLE plan.plan.{table_name} ({column_definitions});")
-                
-                # Insert from df_view
-                con.sql(f"INSERT INTO plan.plan.{table_name} SELECT * FROM df_view;")
-
-            result = con.sql(f"SELECT * FROM plan.plan.{table_name} LIMIT 1").fetchone()
-            logger.info(f"Sample record from {table_name}: {result}")
-            logger.info(f"Data successfully inserted into table '{table_name}'.")
+        result = con.sql(f"SELECT * FROM {table_name} LIMIT 1").fetchone()
+        logger.info(f"Sample record from {table_name}: {result}")
+        logger.info(f"Data successfully inserted into table '{table_name}'.")
     except Exception as e:
         logger.error(f"Error loading data into DuckDB: {e}")
         raise
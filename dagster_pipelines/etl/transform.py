@@ -1,3 +1,4 @@
+import duckdb
 import pandas as pd
 
 # 2.2.1 Pivot data in the "KPI_FY.xlsm" file
@@ -5,6 +6,8 @@ def pivot_data(dataframe: pd.DataFrame) -> pd.DataFrame:
     """
     Pivot the data from the "Data to DB" sheet in the "KPI_FY.xlsm" Excel file.
 
+    The unpivot runs in an in-memory DuckDB database using its native UNPIVOT statement.
+
     Args:
         dataframe (pd.DataFrame): A Pandas DataFrame containing the data to pivot. Defualt is the "Data to DB" sheet in the "KPI_FY.xlsm" Excel file.
 
@@ -12,23 +15,41 @@ def pivot_data(dataframe: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: A Pandas DataFrame containing the pivoted data.
     """
 
-    df = dataframe
-
     # select columns to pivot
     value_vars = [
         'Plan_Total', 'Plan_Q1', 'Plan_Q2', 'Plan_Q3', 'Plan_Q4',
         'Actual_Total', 'Actual_Q1', 'Actual_Q2', 'Actual_Q3', 'Actual_Q4'
     ]
 
-    # melt the data
-    df_melted = df.melt(
-        id_vars=['Fiscal_Year', 'Center_ID', 'Kpi Number', 'Kpi_Name', 'Unit'],
-        value_vars=value_vars,
-        var_name='Amount Name',
-        value_name='Amount'
-    )
-
-    # add a column for the amount type
-    df_melted['Amount Type'] = df_melted['Amount Name'].apply(lambda x: x.split('_')[0])
-
-    return df_melted
\ No newline at end of file
+    quoted_columns = ', '.join(f'"{col}"' for col in value_vars)
+    column_names = ', '.join(f"'{col}'" for col in value_vars)
+
+    with duckdb.connect() as con:
+        # number the source rows, so the output can keep the order pandas melt produced
+        con.register('kpi_raw', dataframe.assign(_row=range(len(dataframe))))
+
+        # unpivot the data and add a column for the amount type
+        # (INCLUDE NULLS keeps empty amounts, and the ORDER BY groups rows by amount column
+        # and then by source row, both as pandas melt did)
+        df_melted = con.sql(f"""
+            SELECT
+                "Fiscal_Year", "Center_ID", "Kpi Number", "Kpi_Name", "Unit",
+                "Amount Name", "Amount",
+                split_part("Amount Name", '_', 1) AS "Amount Type"
+            FROM kpi_raw
+            UNPIVOT INCLUDE NULLS (
+                "Amount" FOR "Amount Name" IN ({quoted_columns})
+            )
+            ORDER BY list_position([{column_names}], "Amount Name"), _row;
+        """).df()
+
+    # store the low-cardinality columns as categoricals instead of repeated strings
+    df_melted = df_melted.astype({
+        'Center_ID': 'category',
+        'Kpi Number': 'category',
+        'Unit': 'category',
+        'Amount Name': pd.CategoricalDtype(value_vars),
+        'Amount Type': 'category',
+    })
+
+    return df_melted
@@ -0,0 +1,38 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import dagster as dg
+import duckdb
+
+# Op tag for assets that open the DuckDB file; the executor runs at most one of them at a time,
+# since only one process can hold the database open for writing
+DUCKDB_OP_TAGS = {"database": "duckdb"}
+
+class DuckDBResource(dg.ConfigurableResource):
+    """
+    Provides connections to the DuckDB database holding the plan schema.
+
+    Each asset opens one connection through get_connection() and passes it to every helper
+    it calls, instead of every helper connecting to the database file on its own.
+
+    Attributes:
+        database (str): Path to the DuckDB database file.
+    """
+
+    database: str = "/opt/dagster/app/dagster_pipelines/db/plan.db"
+
+    @contextmanager
+    def get_connection(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """
+        Opens a connection to the DuckDB database and closes it when the block exits.
+
+        The plan schema is created if needed and made the default schema, so queries can use
+        bare table names instead of resolving plan.plan.<table> on every statement.
+
+        Yields:
+            duckdb.DuckDBPyConnection: An open connection to the database.
+        """
+        with duckdb.connect(self.database) as con:
+            con.sql("CREATE SCHEMA IF NOT EXISTS plan;")
+            con.sql("SET search_path = 'plan';")
+            yield con
@@ -1 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
 
+from dagster_pipelines.assets import compile_schema, validate_data
+from dagster_pipelines.etl.transform import pivot_data
+
+ID_VARS = ["Fiscal_Year", "Center_ID", "Kpi Number", "Kpi_Name", "Unit"]
+VALUE_VARS = [
+    "Plan_Total", "Plan_Q1", "Plan_Q2", "Plan_Q3", "Plan_Q4",
+    "Actual_Total", "Actual_Q1", "Actual_Q2", "Actual_Q3", "Actual_Q4",
+]
+
+
+def _raw_kpi_frame() -> pd.DataFrame:
+    """Two KPI rows shaped like the "Data to DB" sheet after read_excel, with one empty amount."""
+    return pd.DataFrame({
+        "Fiscal_Year": [2568, 2568],
+        "Center_ID": ["10000006", "11000008"],
+        "Kpi Number": ["KPI202", "KPI202"],
+        "Kpi_Name": ["KPI A", "KPI B"],
+        "Unit": ["%", "%"],
+        **{
+            col: np.array([i, np.nan if col == "Actual_Total" else i + 0.5], dtype="float32")
+            for i, col in enumerate(VALUE_VARS)
+        },
+    })
+
+
+def test_pivot_data_matches_melt():
+    raw = _raw_kpi_frame()
+    expected = raw.melt(id_vars=ID_VARS, value_vars=VALUE_VARS, var_name="Amount Name", value_name="Amount")
+    expected["Amount Type"] = expected["Amount Name"].str.split("_").str[0]
+
+    result = pivot_data(raw)
+
+    # same rows (empty amounts included), columns and order as pandas melt
+    assert len(result) == len(raw) * len(VALUE_VARS)
+    pd.testing.assert_frame_equal(result.astype(object), expected.astype(object))
+
+
+def test_pivot_data_dtypes():
+    result = pivot_data(_raw_kpi_frame())
+
+    assert result["Fiscal_Year"].dtype == np.dtype("int64")
+    assert result["Amount"].dtype == np.dtype("float32")
+    for col in ["Center_ID", "Kpi Number", "Unit", "Amount Name", "Amount Type"]:
+        assert isinstance(result[col].dtype, pd.CategoricalDtype)
+    assert list(result["Amount Name"].cat.categories) == VALUE_VARS
+    assert set(result["Amount Type"].cat.categories) == {"Plan", "Actual"}
+
+
+def test_compile_schema_accepts_pandas_dtypes():
+    schema = compile_schema({
+        "Fiscal_Year": int,
+        "Amount": np.float32,
+        "Count": pd.Int64Dtype(),
+        "Amount Type": pd.CategoricalDtype(["Plan", "Actual"]),
+        "Unit": "category",
+    })
+
+    assert schema == {
+        "Fiscal_Year": np.dtype("int64"),
+        "Amount": np.dtype("float32"),
+        "Count": pd.Int64Dtype(),
+        "Amount Type": pd.CategoricalDtype(["Plan", "Actual"]),
+        "Unit": "category",
+    }
+
+
+def test_validate_data_accepts_matching_frame():
+    df = pd.DataFrame({"Center_ID": ["10000006"], "Unit": pd.Categorical(["%"]), "Amount": np.float32([1.5])})
+    schema = compile_schema({"Center_ID": str, "Unit": "category", "Amount": np.float32})
+
+    assert validate_data(df, schema, "passed") is df
+
+
+def test_validate_data_lists_every_missing_column():
+    df = pd.DataFrame({"Center_ID": ["10000006"]})
+    schema = compile_schema({"Center_ID": str, "Center_Name": str, "Unit": "category"})
+
+    with pytest.raises(ValueError) as excinfo:
+        validate_data(df, schema, "passed")
+
+    assert str(excinfo.value) == "Missing expected column: Center_Name; Missing expected column: Unit"
+
+
+def test_validate_data_lists_every_mismatched_column():
+    df = pd.DataFrame({"Fiscal_Year": ["2568"], "Center_ID": ["10000006"], "Amount": [1.5], "Unit": ["%"]})
+    schema = compile_schema({"Fiscal_Year": int, "Center_ID": str, "Amount": np.float32, "Unit": "category"})
+
+    with pytest.raises(TypeError) as excinfo:
+        validate_data(df, schema, "passed")
+
+    message = str(excinfo.value)
+    for col in ["Fiscal_Year", "Amount", "Unit"]:
+        assert f"Column '{col}'" in message
+    assert "Center_ID" not in message
@@ -0,0 +1,195 @@
+import inspect
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from dagster_pipelines.etl import extract
+
+
+ID_COLUMNS = ["Fiscal_Year", "Center_ID", "Kpi Number", "Kpi_Name", "Unit"]
+NUMERIC_COLUMNS = [
+    "Plan_Total", "Plan_Q1", "Plan_Q2", "Plan_Q3", "Plan_Q4",
+    "Actual_Total", "Actual_Q1", "Actual_Q2", "Actual_Q3", "Actual_Q4",
+]
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep every cached frame written by these tests inside tmp_path."""
+    path = tmp_path / "cache"
+    monkeypatch.setattr(extract, "CACHE_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    path = tmp_path / "source.txt"
+    path.write_text("first")
+    return path
+
+
+@pytest.fixture
+def cached_reader():
+    """A reader wrapped with cache_by_source_file, plus the list of calls that really parsed the file."""
+    calls = []
+
+    def read_text(file_path: str, validate_dtypes: bool = True) -> pd.DataFrame:
+        calls.append(validate_dtypes)
+        with open(file_path) as f:
+            return pd.DataFrame({"text": [f.read()], "validated": [validate_dtypes]})
+
+    return extract.cache_by_source_file(read_text), calls
+
+
+def test_cache_hit_when_source_unchanged(cached_reader, source_file):
+    read_text, calls = cached_reader
+
+    first = read_text(str(source_file))
+    second = read_text(str(source_file))
+
+    assert calls == [True]
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_cache_miss_after_mtime_change(cached_reader, source_file):
+    read_text, calls = cached_reader
+    read_text(str(source_file))
+
+    stat = os.stat(source_file)
+    os.utime(source_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    read_text(str(source_file))
+
+    assert len(calls) == 2
+
+
+def test_cache_miss_after_size_change(cached_reader, source_file):
+    read_text, calls = cached_reader
+    read_text(str(source_file))
+
+    source_file.write_text("second, longer")
+    result = read_text(str(source_file))
+
+    assert len(calls) == 2
+    assert result["text"].iloc[0] == "second, longer"
+
+
+def test_cache_miss_after_validate_dtypes_change(cached_reader, source_file):
+    read_text, calls = cached_reader
+
+    read_text(str(source_file))
+    result = read_text(str(source_file), validate_dtypes=False)
+
+    assert calls == [True, False]
+    assert not result["validated"].iloc[0]
+
+
+@pytest.mark.parametrize("mode", [0o770, 0o707, 0o777])
+def test_cache_unused_when_dir_writable_by_others(cached_reader, source_file, cache_dir, monkeypatch, mode):
+    read_text, calls = cached_reader
+    cache_dir.mkdir()
+    cache_dir.chmod(mode)
+
+    def fail_read_pickle(*args, **kwargs):
+        raise AssertionError("pickle read from a directory writable by others")
+
+    monkeypatch.setattr(pd, "read_pickle", fail_read_pickle)
+    read_text(str(source_file))
+    read_text(str(source_file))
+
+    assert len(calls) == 2
+    assert list(cache_dir.iterdir()) == []
+
+
+def test_corrupt_pickle_falls_back_to_parsing(cached_reader, source_file, cache_dir):
+    read_text, calls = cached_reader
+    read_text(str(source_file))
+
+    for pickle_file in cache_dir.iterdir():
+        pickle_file.write_bytes(b"not a pickle")
+    result = read_text(str(source_file))
+
+    assert len(calls) == 2
+    assert result["text"].iloc[0] == "first"
+
+
+def test_cache_works_without_reader_source(source_file, monkeypatch):
+    def no_source(obj):
+        raise OSError("could not get source code")
+
+    monkeypatch.setattr(inspect, "getsource", no_source)
+    calls = []
+
+    @extract.cache_by_source_file
+    def read_text(file_path: str) -> pd.DataFrame:
+        calls.append(file_path)
+        with open(file_path) as f:
+            return pd.DataFrame({"text": [f.read()]})
+
+    read_text(str(source_file))
+    read_text(str(source_file))
+
+    assert len(calls) == 1
+
+
+def _write_kpi_workbook(path, header):
+    """
+    Write a small "Data to DB" sheet: two KPI rows, a missing Kpi_Name, a "No" amount, a column of values
+    under a blank header cell and trailing formatted-but-empty rows.
+    """
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Data to DB"
+    ws.append(header)
+    ws.append([2568, 10000006, "KPI202", "KPI A", "%", 95, 95, 95, 95, 95, "No", 93.81, 100, 98.15, 99.52, "note"])
+    ws.append([2568, "1207A000", "KPI202", None, "%", 80, None, 80, 80, 80, 4.65, None, 5.5, 6, 7, None])
+    for row in range(6, 9):
+        ws.cell(row=row, column=6).number_format = "0.00"
+    wb.save(path)
+    return path
+
+
+def _normalize(df):
+    """Compare frames cell by cell as Python objects, with every missing value as None."""
+    df = df.astype(object)
+    return df.where(df.notna(), None)
+
+
+def test_read_excel_matches_pandas_parser(tmp_path):
+    path = _write_kpi_workbook(tmp_path / "kpi.xlsx", ID_COLUMNS + NUMERIC_COLUMNS + [None])
+
+    result = extract.read_excel(file_path=str(path), validate_dtypes=False)
+
+    # the column under the blank header cell is skipped instead of becoming "Unnamed: 15"
+    expected = pd.read_excel(path, sheet_name="Data to DB").drop(columns="Unnamed: 15")
+    pd.testing.assert_frame_equal(_normalize(result), _normalize(expected))
+
+
+def test_read_excel_validated_dtypes(tmp_path):
+    path = _write_kpi_workbook(tmp_path / "kpi.xlsx", ID_COLUMNS + NUMERIC_COLUMNS + [None])
+
+    result = extract.read_excel(file_path=str(path), validate_dtypes=True)
+
+    # same as the pandas parser with the baseline casts, except that missing text stays None instead of 'nan'
+    expected = pd.read_excel(path, sheet_name="Data to DB").drop(columns="Unnamed: 15")
+    for col in NUMERIC_COLUMNS:
+        expected[col] = pd.to_numeric(expected[col], errors="coerce").astype("float32")
+    for col in ID_COLUMNS[1:]:
+        expected[col] = expected[col].map(lambda value: value if pd.isna(value) else str(value))
+    pd.testing.assert_frame_equal(_normalize(result), _normalize(expected))
+
+    assert result["Fiscal_Year"].dtype == np.dtype("int64")
+    assert all(result[col].dtype == np.dtype("float32") for col in NUMERIC_COLUMNS)
+    assert list(result["Center_ID"]) == ["10000006", "1207A000"]
+    assert result["Kpi_Name"].iloc[1] is None
+    assert np.isnan(result["Actual_Total"].iloc[0])
+
+
+def test_read_excel_rejects_duplicate_headers(tmp_path):
+    header = ID_COLUMNS + NUMERIC_COLUMNS[:-1] + ["Actual_Q3", None]
+    path = _write_kpi_workbook(tmp_path / "kpi.xlsx", header)
+
+    with pytest.raises(ValueError, match="Duplicate column names in the Excel file: Actual_Q3"):
+        extract.read_excel(file_path=str(path))
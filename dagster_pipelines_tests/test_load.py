@@ -0,0 +1,60 @@
+import duckdb
+import pandas as pd
+import pytest
+
+from dagster_pipelines.etl.load import load_to_duckdb, parse_column_definitions
+
+
+def test_parse_column_definitions_keeps_commas_inside_types():
+    assert parse_column_definitions("Amount DECIMAL(10, 2), Center_Name NVARCHAR") == [
+        ("Amount", "DECIMAL(10, 2)"),
+        ("Center_Name", "NVARCHAR"),
+    ]
+
+
+def test_parse_column_definitions_multiline_kpi_fy():
+    column_definitions = """
+        Fiscal_Year INT,
+        Center_ID VARCHAR(8),
+        Kpi_Number VARCHAR(6),
+        Kpi_Name NVARCHAR,
+        Unit NVARCHAR(50),
+        Amount_Name VARCHAR(255),
+        Amount FLOAT,
+        Amount_Type VARCHAR(50)
+    """
+    assert parse_column_definitions(column_definitions) == [
+        ("Fiscal_Year", "INT"),
+        ("Center_ID", "VARCHAR(8)"),
+        ("Kpi_Number", "VARCHAR(6)"),
+        ("Kpi_Name", "NVARCHAR"),
+        ("Unit", "NVARCHAR(50)"),
+        ("Amount_Name", "VARCHAR(255)"),
+        ("Amount", "FLOAT"),
+        ("Amount_Type", "VARCHAR(50)"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "column_definitions",
+    [
+        "Center_ID VARCHAR(8) NOT NULL, Center_Name NVARCHAR",
+        "Center_ID VARCHAR(8) PRIMARY KEY, Center_Name NVARCHAR",
+        "Center_ID VARCHAR(8), Center_Name NVARCHAR DEFAULT 'x'",
+        "Center_ID VARCHAR(8), Center_Name NVARCHAR, PRIMARY KEY (Center_ID)",
+        "Center_ID",
+    ],
+)
+def test_parse_column_definitions_rejects_constraints(column_definitions):
+    with pytest.raises(ValueError, match="Unsupported column definition"):
+        parse_column_definitions(column_definitions)
+
+
+def test_load_to_duckdb_casts_columns_by_position():
+    df = pd.DataFrame({"Center ID": [10000000], 'Center "Name"': ["ศูนย์การศึกษา 1"]})
+
+    with duckdb.connect() as con:
+        load_to_duckdb(df, "M_Center", "Center_ID VARCHAR(8), Center_Name NVARCHAR", con=con)
+
+        assert con.sql("SELECT Center_ID, Center_Name FROM M_Center").fetchall() == [("10000000", "ศูนย์การศึกษา 1")]
+        assert con.sql("SELECT count(*) FROM M_Center_preview").fetchone() == (1,)